@@ -9,10 +9,13 @@ from google.adk.agents.remote_a2a_agent import RemoteA2aAgent
 from google.auth import default
 from google.auth.transport.requests import Request
 from a2a.client import ClientConfig, ClientFactory
-from a2a.types import TransportProtocol
+from a2a.types import AgentCard, TransportProtocol
 import httpx
 import logging
 import asyncio
+import traceback
+import uuid
+from datetime import datetime, timezone
 import vertexai
 
 # Setup logging
@@ -42,38 +45,74 @@ analyzer_card_url = f"https://{LOCATION}-aiplatform.googleapis.com/v1beta1/proje
 generator_card_url = f"https://{LOCATION}-aiplatform.googleapis.com/v1beta1/projects/{PROJECT_ID}/locations/{LOCATION}/reasoningEngines/{GENERATOR_RESOURCE_ID}/a2a/v1/card"
 
 # ✅ Create authenticated A2A client factory
+a2a_http_client = None
+
 def create_client_factory():
-    """Create ClientFactory with fresh credentials"""
-    # Refresh credentials to ensure they're valid
-    credentials.refresh(Request())
+    """Create ClientFactory with the current credentials"""
+    global a2a_http_client
+    a2a_http_client = httpx.AsyncClient(
+        headers={
+            "Authorization": f"Bearer {credentials.token}",
+            "Content-Type": "application/json",
+        },
+        timeout=60.0  # Increased timeout for remote agents
+    )
 
     return ClientFactory(
         ClientConfig(
             supported_transports=[TransportProtocol.http_json],
             use_client_preference=True,
-            httpx_client=httpx.AsyncClient(
-                headers={
-                    "Authorization": f"Bearer {credentials.token}",
-                    "Content-Type": "application/json",
-                },
-                timeout=60.0  # Increased timeout for remote agents
-            ),
+            httpx_client=a2a_http_client,
         )
     )
 
+# ✅ Background token refresh (keeps the shared client's bearer token valid)
+TOKEN_REFRESH_MARGIN = 60  # Seconds before expiry to refresh
+TOKEN_REFRESH_RETRY = 30  # Seconds to wait after a failed refresh
+token_refresh_task = None
+
+async def refresh_token_periodically():
+    """Refresh credentials shortly before they expire, off the event loop"""
+    # Credentials without an expiry never need a timed refresh
+    while credentials.expiry:
+        # google.auth reports expiry as a naive UTC datetime
+        now = datetime.now(timezone.utc).replace(tzinfo=None)
+        remaining = (credentials.expiry - now).total_seconds()
+        await asyncio.sleep(max(remaining - TOKEN_REFRESH_MARGIN, 0))
+
+        try:
+            # google.auth is synchronous, so run the refresh in a worker thread
+            await asyncio.to_thread(credentials.refresh, Request())
+            a2a_http_client.headers["Authorization"] = f"Bearer {credentials.token}"
+        except Exception as e:
+            logger.error("❌ Failed to refresh credentials: %s", e)
+            await asyncio.sleep(TOKEN_REFRESH_RETRY)
+
+# ✅ Shared A2A client factory (built once, reused by every remote agent)
+client_factory = None
+
+def get_client_factory():
+    """Return the shared ClientFactory, creating it and its token refresher on first use"""
+    global client_factory, token_refresh_task
+    if client_factory is None:
+        client_factory = create_client_factory()
+        if credentials.expiry:
+            token_refresh_task = asyncio.create_task(refresh_token_periodically())
+    return client_factory
+
+def get_a2a_http_client():
+    """Return the shared authenticated httpx client behind the ClientFactory"""
+    get_client_factory()
+    return a2a_http_client
+
 # ✅ Fetch agent card with authentication
-async def fetch_agent_card(card_url: str):
-    """Fetch agent card via authenticated HTTP request"""
-    async with httpx.AsyncClient(timeout=5.0) as client:
-        response = await client.get(
-            card_url,
-            headers={
-                "Authorization": f"Bearer {credentials.token}",
-                "Content-Type": "application/json",
-            }
-        )
-        response.raise_for_status()
-        return response.json()
+async def fetch_agent_card(card_url: str) -> AgentCard:
+    """Fetch and parse agent card via authenticated HTTP request"""
+    # Reuse the factory's authenticated client so card fetches and A2A calls
+    # share one connection pool and one refreshed token
+    response = await get_a2a_http_client().get(card_url, timeout=5.0)
+    response.raise_for_status()
+    return AgentCard.model_validate_json(response.content)
 
 # ✅ Create RemoteA2aAgent for Analyzer with authentication
 async def create_analyzer_agent():
@@ -81,32 +120,45 @@ async def create_analyzer_agent():
     try:
         # Fetch the agent card
         agent_card = await fetch_agent_card(analyzer_card_url)
-        logger.info(f"✅ Fetched analyzer agent card: {agent_card.get('name', 'Unknown')}")
+        logger.info("✅ Fetched analyzer agent card: %s", agent_card.name)
 
-        # Create the remote agent with factory
+        # Create the remote agent with factory, passing the already-fetched card
+        # so it is not resolved from the URL a second time
         analyzer_agent = RemoteA2aAgent(
             name="requirement_analyzer",
             description="Expert Requirements Analyzer specializing in authentication systems",
-            agent_card=analyzer_card_url,
-            a2a_client_factory=create_client_factory(),
+            agent_card=agent_card,
+            a2a_client_factory=get_client_factory(),
         )
 
         return analyzer_agent
 
     except Exception as e:
-        logger.error(f"❌ Failed to create analyzer agent: {e}")
+        logger.error("❌ Failed to create analyzer agent: %s", e)
         # Fallback: try URL-only approach (less reliable but worth a try)
         logger.info("⚠️  Attempting fallback URL-only approach...")
         return RemoteA2aAgent(
             name="requirement_analyzer",
             description="Expert Requirements Analyzer",
             agent_card=analyzer_card_url,
-            a2a_client_factory=create_client_factory(),
+            a2a_client_factory=get_client_factory(),
         )
 
 # ✅ Initialize the analyzer agent
 # Note: This is async, so we'll handle it in the main flow
 analyzer_agent = None
+analyzer_agent_lock = asyncio.Lock()
+
+async def get_analyzer_agent():
+    """Return the shared analyzer agent, creating it exactly once"""
+    global analyzer_agent
+    if analyzer_agent is None:
+        async with analyzer_agent_lock:
+            # Re-check under the lock: another caller may have finished first
+            if analyzer_agent is None:
+                logger.info("🔧 Initializing analyzer agent...")
+                analyzer_agent = await create_analyzer_agent()
+    return analyzer_agent
 
 # ✅ Root Decider Agent (Simplified)
 def create_root_agent(sub_agents):
@@ -154,41 +206,79 @@ def create_root_agent(sub_agents):
         sub_agents=sub_agents,
     )
 
+# ✅ Root agent and runner are built once on first query and reused afterwards
+root_agent = None
+runner = None
+
+async def get_runner():
+    """Return the shared decider runner, building the root agent on first use"""
+    global root_agent, runner
+    if runner is None:
+        # Initialize analyzer agent if not already done
+        sub_agent = await get_analyzer_agent()
+
+        # Re-check after the await; a sub-agent can only be attached to a single parent
+        if runner is None:
+            root_agent = create_root_agent([sub_agent])
+            runner = Runner(
+                agent=root_agent,
+                app_name="decider_app",
+                session_service=InMemorySessionService(),
+                artifact_service=InMemoryArtifactService(),
+                memory_service=InMemoryMemoryService(),
+            )
+    return runner
+
+# ✅ Warm-up: fetch the analyzer card and build the runner before the first query
+async def warmup():
+    """Initialize remote agents and the runner ahead of the first query"""
+    await get_runner()
+
+# ✅ Shutdown: release shared clients so a later run starts from a clean state
+async def shutdown():
+    """Stop the token refresher, close the shared client and reset cached agents"""
+    global client_factory, a2a_http_client, token_refresh_task
+    global analyzer_agent, analyzer_agent_lock, root_agent, runner
+
+    if token_refresh_task is not None:
+        token_refresh_task.cancel()
+        try:
+            await token_refresh_task
+        except asyncio.CancelledError:
+            pass
+
+    if client_factory is not None:
+        await get_a2a_http_client().aclose()
+
+    client_factory = None
+    a2a_http_client = None
+    token_refresh_task = None
+    analyzer_agent = None
+    # The lock may be bound to the event loop that is shutting down
+    analyzer_agent_lock = asyncio.Lock()
+    root_agent = None
+    runner = None
+
 # ✅ Process Query Function
 async def process_query(user_query: str, user_id: str = "user") -> str:
     """
     Process a user query through the decider agent system.
-    """
-    global analyzer_agent
-
-    # Initialize analyzer agent if not already done
-    if analyzer_agent is None:
-        logger.info("🔧 Initializing analyzer agent...")
-        analyzer_agent = await create_analyzer_agent()
 
-    # Create root agent with initialized sub-agents
-    root_agent = create_root_agent([analyzer_agent])
+    Each query runs in its own fresh session on the shared runner.
+    """
+    decider_runner = await get_runner()
+    session_id = f"session-{user_id}-{uuid.uuid4().hex}"
 
     print(f"\n{'='*60}")
     print(f"Query: {user_query}")
     print('='*60)
 
     try:
-        # Create session service
-        session_service = InMemorySessionService()
-        session = await session_service.create_session(
-            app_name="decider_app",
+        # Create a one-off session for this query
+        session = await decider_runner.session_service.create_session(
+            app_name=decider_runner.app_name,
             user_id=user_id,
-            session_id=f"session-{user_id}"
-        )
-
-        # Create runner for root agent
-        runner = Runner(
-            agent=root_agent,
-            app_name="decider_app",
-            session_service=session_service,
-            artifact_service=InMemoryArtifactService(),
-            memory_service=InMemoryMemoryService(),
+            session_id=session_id
         )
 
         # Prepare user message
@@ -202,7 +292,7 @@ async def process_query(user_query: str, user_id: str = "user") -> str:
         print("-" * 60)
 
         final_response = ""
-        async for event in runner.run_async(
+        async for event in decider_runner.run_async(
             user_id=user_id,
             session_id=session.id,
             new_message=content
@@ -212,7 +302,7 @@ async def process_query(user_query: str, user_id: str = "user") -> str:
                 if event.content and event.content.parts:
                     final_response = "".join(
                         part.text for part in event.content.parts
-                        if hasattr(part, 'text') and part.text
+                        if part.text
                     )
                     print(final_response)
                     break
@@ -224,10 +314,29 @@ async def process_query(user_query: str, user_id: str = "user") -> str:
 
     except Exception as e:
         print(f"\n❌ Error: {e}")
-        import traceback
         traceback.print_exc()
         return None
 
+    finally:
+        # Drop the one-off session so the shared session service does not grow
+        await decider_runner.session_service.delete_session(
+            app_name=decider_runner.app_name,
+            user_id=user_id,
+            session_id=session_id
+        )
+
+
+# ✅ Event loop runner
+def run_event_loop(main):
+    """Run a coroutine on uvloop when a version with uvloop.run (0.18+) is installed"""
+    try:
+        import uvloop
+    except ImportError:
+        uvloop = None
+    if uvloop is None or not hasattr(uvloop, "run"):
+        return asyncio.run(main)
+    return uvloop.run(main)
+
 
 # ✅ Test Script
 async def run_tests():
@@ -242,20 +351,26 @@ async def run_tests():
     print("🚀 Starting Decider Agent Tests")
     print("="*60)
 
-    for i, query in enumerate(test_queries, 1):
-        print(f"\n\n{'#'*60}")
-        print(f"# Test {i}/{len(test_queries)}")
-        print(f"{'#'*60}")
+    try:
+        await warmup()
+
+        for i, query in enumerate(test_queries, 1):
+            print(f"\n\n{'#'*60}")
+            print(f"# Test {i}/{len(test_queries)}")
+            print(f"{'#'*60}")
+
+            response = await process_query(query, user_id=f"test_user_{i:03d}")
 
-        response = await process_query(query, user_id=f"test_user_{i:03d}")
+            if response:
+                print(f"✅ Test {i} passed")
+            else:
+                print(f"❌ Test {i} failed")
 
-        if response:
-            print(f"✅ Test {i} passed")
-        else:
-            print(f"❌ Test {i} failed")
+            if i < len(test_queries):
+                await asyncio.sleep(2)  # Pause between tests
 
-        if i < len(test_queries):
-            await asyncio.sleep(2)  # Pause between tests
+    finally:
+        await shutdown()
 
     print("\n" + "="*60)
     print("🎉 All tests completed!")
@@ -263,5 +378,5 @@ async def run_tests():
 
 
 if __name__ == "__main__":
-    asyncio.run(run_tests())
+    run_event_loop(run_tests())
 
@@ -1,7 +1,6 @@
-import asyncio
 from google.adk.sessions import InMemorySessionService
 from google.genai import types
-from agent import decider_agent  # Your fixed agent
+from agent import decider_agent, run_event_loop  # Your fixed agent
 
 async def run_decider_session():
     """
@@ -43,4 +42,4 @@ async def run_decider_session():
         session_service.delete_session(session.id)
 
 if __name__ == "__main__":
-    asyncio.run(run_decider_session())
+    run_event_loop(run_decider_session())
@@ -239,7 +239,7 @@ class RequirementAnalyzerExecutor(AgentExecutor):
             if final_response and final_response.content and final_response.content.parts:
                 response_text = "".join(
                     part.text for part in final_response.content.parts
-                    if hasattr(part, 'text') and part.text
+                    if part.text
                 )
 
                 if response_text:
@@ -20,7 +20,7 @@ async def retrieve_requirements_context_tool(
 
     try:
         # Basic analysis of requirements input
-        requirements_lines = [line.strip() for line in requirements_input.split('\n') if line.strip()]
+        requirements_lines = [line for line in map(str.strip, requirements_input.split('\n')) if line]
 
         # Simple categorization based on keywords (can be enhanced)
         functional_requirements = []